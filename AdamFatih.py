@@ -1,10 +1,14 @@
+import io
 import streamlit as st
 import pandas as pd
 import numpy as np
 import math
-import matplotlib.pyplot as plt
-from PIL import Image
-from matplotlib.lines import Line2D
+import string
+import http.client
+import urllib.request
+
+# Figures are built with the object-oriented API, outside pyplot
+from matplotlib.figure import Figure
 
 # Configuration
 st.set_page_config(
@@ -24,6 +28,28 @@ COLORS = {
     'KeyPoints': '#000000'    # Black
 }
 
+# Fatigue criteria, in the order results are reported
+FATIGUE_CRITERIA = ('Goodman', 'Soderberg', 'Gerber', 'Morrow', 'ASME-Elliptic')
+FATIGUE_COLORS = tuple(COLORS[name] for name in FATIGUE_CRITERIA)
+FATIGUE_LINESTYLES = ('-', '--', ':', '-.', (0, (5, 1)))
+FATIGUE_EQUATIONS = (
+    "σa/Se + σm/UTS = 1",
+    "σa/Se + σm/Sy = 1",
+    "σa/Se + (σm/UTS)² = 1",
+    "σa/Se + σm/(UTS+345) = 1",
+    "(σa/Se)² + (σm/Sy)² = 1"
+)
+
+# Row labels of the dataset comparison table
+COMPARISON_PARAMETERS = ("Mean Stress (σm)", "Alternating Stress (σa)") + FATIGUE_CRITERIA
+
+# Sidebar parameters, in form order - each is also its widget's session state key
+INPUT_KEYS = (
+    'pipe_thickness', 'pipe_diameter', 'pipe_length', 'corrosion_length', 'corrosion_depth',
+    'yield_stress', 'uts', 'max_pressure', 'min_pressure',
+    'inspection_year', 'radial_corrosion_rate', 'axial_corrosion_rate', 'projection_years'
+)
+
 # Dataset colors for the three operating points
 DATASET_COLORS = ['#FF0000', '#00FF00', '#0000FF']  # Red, Green, Blue
 
@@ -36,262 +62,421 @@ WHITE = "#FFFFFF"
 ACCENT = "#444444"  # Dark gray for visual hierarchy
 RED = "#FF0000"     # For critical indicators
 
-# Custom CSS for high-contrast black and white styling
-st.markdown(f"""
-<style>
+# Burst pressure methods, in the order calculate_pressures reports them, with their card colors
+BURST_NAMES = ("Von Mises", "Tresca", "ASME B31G", "DNV", "PCORRC")
+BURST_COLORS = (BLACK, MEDIUM_GRAY, DARK_GRAY, ACCENT, BLACK)
+
+# Corrosion defect geometry schematic shown beside the assessment protocol
+DEFECT_GEOMETRY_IMAGE_URL = "https://www.researchgate.net/profile/Changqing-Gong/publication/313456917/figure/fig1/AS:573308992266241@1513698923813/Schematic-illustration-of-the-geometry-of-a-typical-corrosion-defect.png"
+
+# Stress parameter table - palette baked in once, formatted values substituted per render
+STRESS_TABLE_KEYS = ('sigma_vm_max', 'sigma_vm_min', 'sigma_a', 'sigma_m', 'Se')
+STRESS_TABLE_TEMPLATE = string.Template(f"""
+<div class="material-card">
+    <h4>Stress Parameters</h4>
+    <table style="width:100%; border-collapse: collapse; font-size: 0.95rem;">
+        <tr style="border-bottom: 1px solid {BLACK};">
+            <td style="padding: 8px;">Max VM Stress</td>
+            <td style="text-align: right; padding: 8px; font-weight: bold;">$sigma_vm_max MPa</td>
+        </tr>
+        <tr style="border-bottom: 1px solid {BLACK};">
+            <td style="padding: 8px;">Min VM Stress</td>
+            <td style="text-align: right; padding: 8px; font-weight: bold;">$sigma_vm_min MPa</td>
+        </tr>
+        <tr style="border-bottom: 1px solid {BLACK};">
+            <td style="padding: 8px;">Alternating Stress</td>
+            <td style="text-align: right; padding: 8px; font-weight: bold;">$sigma_a MPa</td>
+        </tr>
+        <tr style="border-bottom: 1px solid {BLACK};">
+            <td style="padding: 8px;">Mean Stress</td>
+            <td style="text-align: right; padding: 8px; font-weight: bold;">$sigma_m MPa</td>
+        </tr>
+        <tr>
+            <td style="padding: 8px;">Endurance Limit</td>
+            <td style="text-align: right; padding: 8px; font-weight: bold;">$Se MPa</td>
+        </tr>
+    </table>
+</div>
+""")
+
+# Result cards - one template per card row, substituted once per card
+BURST_CARD_TEMPLATE = string.Template(f"""
+<div class="card" style="border-left: 4px solid $color;">
+    <h4 style="margin-top: 0;">$name</h4>
+    <div class="value-display">$value MPa</div>
+    <div style="height: 4px; background: {LIGHT_GRAY}; margin: 10px 0;">
+        <div style="height: 4px; background: $color; width: $width%;"></div>
+    </div>
+</div>""")
+
+FATIGUE_CARD_TEMPLATE = string.Template(f"""
+<div class="card" style="border-left: 4px solid $color;">
+    <h4 style="margin-top: 0;">$name</h4>
+    <div style="font-size: 0.85em; margin-bottom: 10px; color:{BLACK};">$equation</div>
+    <div class="value-display">$value</div>
+    <div class="$status_class" style="margin-top: 10px;">$status</div>
+    <div style="height: 4px; background: {LIGHT_GRAY}; margin: 10px 0;">
+        <div style="height: 4px; background: $color; width: $width%;"></div>
+    </div>
+</div>""")
+
+# Section headers and FFS metric cards - markup fixed at import, only the
+# title, value and value colour substituted per render
+SECTION_HEADER_TEMPLATE = string.Template("""
+<div class="section-header">
+    <h3 style="margin:0;">$title</h3>
+</div>
+""")
+
+METRIC_CARD_TEMPLATE = string.Template("""
+<div class="material-card">
+    <h4>$title</h4>
+    <div style="font-size: 2rem; font-weight: bold; text-align: center; color: $color;">$value</div>
+</div>
+""")
+
+PARAMETER_PANEL_TEMPLATE = string.Template(f"""
+<div style="background-color:{WHITE}; padding:10px; border-radius:4px; margin-bottom:15px; border: 1px solid {BLACK}">
+    <h3 style="color:{BLACK}; margin:0;">Pipeline Parameters</h3>
+    <p style="color:{BLACK}; margin:0;">Current: <strong>$dataset</strong></p>
+</div>
+""")
+
+# Assessment protocol beside the defect schematic - only the progress width and
+# status text change between runs
+PROTOCOL_CARD_TEMPLATE = string.Template(f"""
+<div class="material-card">
+    <h4 style="border-bottom: 1px solid {BLACK}; padding-bottom: 5px;">Assessment Protocol</h4>
+    <ol>
+        <li>Select dataset to configure</li>
+        <li>Enter pipeline dimensions and material properties</li>
+        <li>Specify operating pressure range</li>
+        <li>Click "Run Analysis" to perform assessment</li>
+        <li>Review burst pressure calculations</li>
+        <li>Analyze stress and fatigue results</li>
+        <li>Compare multiple datasets on fatigue diagram</li>
+    </ol>
+    <div class="progress-container">
+        <div class="progress-bar" style="width: $width;"></div>
+    </div>
+    <p style="text-align: right; margin:0; color:{BLACK};">Status: $status</p>
+</div>
+""")
+
+# Stylesheet rules - a constant string; every colour comes from the :root
+# custom properties that build_stylesheet() puts in front of it
+STYLESHEET_RULES = """
     /* Main styling */
-    .stApp {{
-        background-color: {WHITE};
-        color: {BLACK};
+    .stApp {
+        background-color: var(--palette-white);
+        color: var(--palette-black);
         font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-    }}
+    }
     
     /* Titles and headers */
-    h1, h2, h3, h4, h5, h6 {{
-        color: {BLACK} !important;
-        border-bottom: 2px solid {BLACK};
+    h1, h2, h3, h4, h5, h6 {
+        color: var(--palette-black) !important;
+        border-bottom: 2px solid var(--palette-black);
         padding-bottom: 0.3rem;
-    }}
+    }
     
     /* Sidebar styling */
-    [data-testid="stSidebar"] {{
-        background-color: {WHITE};
-        color: {BLACK};
-        border-right: 1px solid {MEDIUM_GRAY};
-    }}
+    [data-testid="stSidebar"] {
+        background-color: var(--palette-white);
+        color: var(--palette-black);
+        border-right: 1px solid var(--palette-medium-gray);
+    }
     
-    .sidebar .sidebar-content {{
-        background-color: {WHITE};
-        color: {BLACK};
-    }}
+    .sidebar .sidebar-content {
+        background-color: var(--palette-white);
+        color: var(--palette-black);
+    }
     
     /* Button styling */
-    .stButton>button {{
-        background-color: {MEDIUM_GRAY};
-        color: {WHITE};
+    .stButton>button {
+        background-color: var(--palette-medium-gray);
+        color: var(--palette-white);
         border-radius: 4px;
-        border: 1px solid {BLACK};
+        border: 1px solid var(--palette-black);
         font-weight: bold;
         padding: 0.5rem 1rem;
-    }}
+    }
     
-    .stButton>button:hover {{
-        background-color: {DARK_GRAY};
-        color: {WHITE};
-    }}
+    .stButton>button:hover {
+        background-color: var(--palette-dark-gray);
+        color: var(--palette-white);
+    }
     
     /* Card styling */
-    .card {{
-        background: {WHITE};
+    .card {
+        background: var(--palette-white);
         border-radius: 5px;
         box-shadow: 0 2px 8px rgba(0,0,0,0.1);
         padding: 15px;
         margin-bottom: 15px;
-        border-left: 4px solid {BLACK};
-        border: 1px solid {BLACK};
-    }}
+        border-left: 4px solid var(--palette-black);
+        border: 1px solid var(--palette-black);
+    }
+    
+    /* Five-across card row rendered as a single element */
+    .card-grid {
+        display: grid;
+        grid-template-columns: repeat(5, 1fr);
+        gap: 16px;
+    }
     
     /* Status indicators */
-    .safe {{
-        color: {MEDIUM_GRAY};
+    .safe {
+        color: var(--palette-medium-gray);
         font-weight: bold;
-    }}
+    }
     
-    .unsafe {{
-        color: {RED};
+    .unsafe {
+        color: var(--palette-red);
         font-weight: bold;
-    }}
+    }
     
     /* Value display */
-    .value-display {{
+    .value-display {
         font-size: 1.6rem;
         font-weight: bold;
-        color: {BLACK};
-    }}
+        color: var(--palette-black);
+    }
     
     /* Section headers */
-    .section-header {{
-        background-color: {LIGHT_GRAY};
-        color: {BLACK};
+    .section-header {
+        background-color: var(--palette-light-gray);
+        color: var(--palette-black);
         padding: 10px 15px;
         border-radius: 4px;
         margin-top: 20px;
-        border-left: 4px solid {BLACK};
-    }}
+        border-left: 4px solid var(--palette-black);
+    }
     
     /* Material design elements */
-    .material-card {{
-        background: {WHITE};
-        border: 1px solid {BLACK};
+    .material-card {
+        background: var(--palette-white);
+        border: 1px solid var(--palette-black);
         border-radius: 4px;
         padding: 15px;
         margin-bottom: 15px;
         box-shadow: 0 2px 6px rgba(0,0,0,0.05);
-    }}
+    }
     
     /* Progress bars */
-    .progress-container {{
+    .progress-container {
         height: 8px;
-        background-color: {LIGHT_GRAY};
+        background-color: var(--palette-light-gray);
         border-radius: 4px;
         margin: 10px 0;
         overflow: hidden;
-    }}
+    }
     
-    .progress-bar {{
+    .progress-bar {
         height: 100%;
-        background-color: {BLACK};
-    }}
+        background-color: var(--palette-black);
+    }
+    
+    /* Column chart drawn with plain HTML bars */
+    .bar-chart {
+        display: flex;
+        align-items: flex-end;
+        justify-content: space-around;
+        height: 240px;
+        border-bottom: 1px solid var(--palette-black);
+        border-left: 1px solid var(--palette-black);
+    }
+    
+    .bar-column {
+        display: flex;
+        flex-direction: column;
+        justify-content: flex-end;
+        align-items: center;
+        height: 100%;
+        font-size: 0.85rem;
+        color: var(--palette-black);
+    }
+    
+    .bar {
+        width: 60px;
+        border: 1px solid var(--palette-black);
+        border-bottom: none;
+    }
+    
+    .bar-labels {
+        display: flex;
+        justify-content: space-around;
+        font-size: 0.85rem;
+        color: var(--palette-black);
+        padding-top: 4px;
+    }
     
     /* Table styling */
-    table {{
-        border: 1px solid {BLACK} !important;
-    }}
+    table {
+        border: 1px solid var(--palette-black) !important;
+    }
     
-    tr {{
-        border-bottom: 1px solid {BLACK} !important;
-    }}
+    tr {
+        border-bottom: 1px solid var(--palette-black) !important;
+    }
     
-    th, td {{
-        color: {BLACK} !important;
-        background-color: {WHITE} !important;
-        border: 1px solid {BLACK} !important;
-    }}
+    th, td {
+        color: var(--palette-black) !important;
+        background-color: var(--palette-white) !important;
+        border: 1px solid var(--palette-black) !important;
+    }
     
     /* Expander styling */
-    .stExpander {{
-        border: 1px solid {BLACK} !important;
+    .stExpander {
+        border: 1px solid var(--palette-black) !important;
         border-radius: 4px;
         margin-bottom: 10px;
-    }}
+    }
     
-    .st-emotion-cache-1c7k2aw {{
-        border-color: {BLACK} !important;
-    }}
+    .st-emotion-cache-1c7k2aw {
+        border-color: var(--palette-black) !important;
+    }
     
     /* Plot styling */
-    .st-emotion-cache-1v0mbdj {{
-        border: 1px solid {BLACK} !important;
+    .st-emotion-cache-1v0mbdj {
+        border: 1px solid var(--palette-black) !important;
         border-radius: 4px;
         padding: 10px;
-        background-color: {WHITE} !important;
-    }}
+        background-color: var(--palette-white) !important;
+    }
     
     /* Input fields */
-    .stNumberInput, .stSlider {{
-        color: {BLACK} !important;
-        background-color: {WHITE} !important;
-    }}
+    .stNumberInput, .stSlider {
+        color: var(--palette-black) !important;
+        background-color: var(--palette-white) !important;
+    }
     
     /* Sidebar headers */
-    .sidebar .stExpander > label {{
-        color: {BLACK} !important;
+    .sidebar .stExpander > label {
+        color: var(--palette-black) !important;
         font-weight: bold !important;
-    }}
+    }
 
     /* Add this new section for input fields */
-    .stNumberInput, .stSlider {{
+    .stNumberInput, .stSlider {
         color: var(--text) !important;
-    }}
+    }
     
-    .stNumberInput input, .stSlider input {{
+    .stNumberInput input, .stSlider input {
         color: var(--text) !important;
         background-color: var(--card) !important;
         border: 1px solid var(--border) !important;
-    }}
+    }
     
-    .stNumberInput label, .stSlider label {{
+    .stNumberInput label, .stSlider label {
         color: var(--text) !important;
-    }}
+    }
     
     /* Slider track styling */
-    .stSlider div[data-baseweb="slider"] > div:first-child {{
+    .stSlider div[data-baseweb="slider"] > div:first-child {
         background-color: var(--light-gray) !important;
-    }}
+    }
     
     /* Slider thumb styling */
-    .stSlider div[role="slider"] {{
+    .stSlider div[role="slider"] {
         background-color: var(--border) !important;
         border: 1px solid var(--border) !important;
-    }}
+    }
     
     /* Focus state styling */
-    .stTextInput input:focus, .stNumberInput input:focus, .stTextArea textarea:focus {{
+    .stTextInput input:focus, .stNumberInput input:focus, .stTextArea textarea:focus {
         border-color: var(--accent) !important;
         box-shadow: 0 0 0 0.2rem rgba(100, 100, 100, 0.25) !important;
-    }}
+    }
     
     /* Dataset tabs */
-    .dataset-tab {{
+    .dataset-tab {
         padding: 8px 12px;
         margin-right: 5px;
-        border: 1px solid {BLACK};
+        border: 1px solid var(--palette-black);
         border-radius: 4px;
         cursor: pointer;
         display: inline-block;
-    }}
+    }
     
-    .dataset-tab.active {{
-        background-color: {BLACK};
-        color: {WHITE};
-    }}
+    .dataset-tab.active {
+        background-color: var(--palette-black);
+        color: var(--palette-white);
+    }
     
-    .dataset-tab.inactive {{
-        background-color: {LIGHT_GRAY};
-        color: {BLACK};
-    }}
+    .dataset-tab.inactive {
+        background-color: var(--palette-light-gray);
+        color: var(--palette-black);
+    }
     
     /* Fix for radio buttons in dark mode */
-    .stRadio > div[role="radiogroup"] > label {{
-        color: {BLACK} !important;
-    }}
+    .stRadio > div[role="radiogroup"] > label {
+        color: var(--palette-black) !important;
+    }
     
     /* Custom styling for radio buttons */
-    .stRadio > div {{
+    .stRadio > div {
         flex-direction: row !important;
         gap: 15px !important;
-    }}
+    }
     
-    .stRadio > div > label {{
+    .stRadio > div > label {
         background-color: #f0f0f0;
         padding: 8px 15px;
         border-radius: 4px;
         border: 1px solid #ccc;
         transition: all 0.3s ease;
-    }}
+    }
     
-    .stRadio > div > label:hover {{
+    .stRadio > div > label:hover {
         background-color: #e0e0e0;
-    }}
+    }
     
-    .stRadio > div > [data-baseweb="radio"]:checked + label {{
-        background-color: {DARK_GRAY} !important;
-        color: {WHITE} !important;
-        border-color: {DARK_GRAY};
-    }}
+    .stRadio > div > [data-baseweb="radio"]:checked + label {
+        background-color: var(--palette-dark-gray) !important;
+        color: var(--palette-white) !important;
+        border-color: var(--palette-dark-gray);
+    }
     
     /* FIX FOR DATASET TEXT IN DARK MODE */
     /* Force radio button text to be black in sidebar */
-    .sidebar .stRadio label {{
-        color: {BLACK} !important;
-    }}
+    .sidebar .stRadio label {
+        color: var(--palette-black) !important;
+    }
     
     /* Ensure radio button circles are visible */
-    .stRadio [data-baseweb="radio"] > div > div > div {{
-        background-color: {BLACK} !important;
-    }}
+    .stRadio [data-baseweb="radio"] > div > div > div {
+        background-color: var(--palette-black) !important;
+    }
     
     /* Fix for selected radio button text */
-    .stRadio [data-baseweb="radio"]:checked + label {{
-        color: {WHITE} !important;
-    }}
+    .stRadio [data-baseweb="radio"]:checked + label {
+        color: var(--palette-white) !important;
+    }
     
     /* Fix for non-selected radio button text */
-    .stRadio [data-baseweb="radio"] + label {{
-        color: {BLACK} !important;
-    }}
+    .stRadio [data-baseweb="radio"] + label {
+        color: var(--palette-black) !important;
+    }
 </style>
-""", unsafe_allow_html=True)
+"""
+
+# Custom CSS for high-contrast black and white styling - only called through the
+# cached build_page_head(); the result is still emitted on every run because
+# Streamlit drops page elements that a rerun does not re-emit
+def build_stylesheet():
+    return f"""
+<style>
+    /* Palette as CSS variables - the only part of the stylesheet that is interpolated */
+    :root {{
+        --palette-black: {BLACK};
+        --palette-white: {WHITE};
+        --palette-light-gray: {LIGHT_GRAY};
+        --palette-medium-gray: {MEDIUM_GRAY};
+        --palette-dark-gray: {DARK_GRAY};
+        --palette-red: {RED};
+    }}
+""" + STYLESHEET_RULES
 
 # Initialize session state for datasets
 if 'datasets' not in st.session_state:
@@ -304,13 +489,26 @@ if 'datasets' not in st.session_state:
 if 'current_dataset' not in st.session_state:
     st.session_state.current_dataset = 'Dataset 1'
 
-# App header with high contrast theme
-st.markdown(f"""
+# Button callback - runs before the next script run, so the reset state is
+# rendered in the same rerun the click triggers
+def reset_all_datasets():
+    st.session_state.run_analysis = False
+    # Reset all datasets
+    for key in st.session_state.datasets:
+        st.session_state.datasets[key] = {'inputs': None, 'results': None}
+
+# Stylesheet and app header with high contrast theme - built together once per
+# server process and sent as one element
+@st.cache_resource(show_spinner=False)
+def build_page_head():
+    return build_stylesheet() + f"""
 <div style="background-color:{WHITE}; padding:20px; border-radius:5px; margin-bottom:20px; border-bottom: 3px solid {BLACK}">
     <h1 style="color:{BLACK}; margin:0;">⚙️ Assessment & Diagnostics for Aging Materials Fatigue Assessment Tool for Integrity and Health (Adam-Fatih)</h1>
     <p style="color:{DARK_GRAY};">Pipeline Integrity Management System</p>
 </div>
-""", unsafe_allow_html=True)
+"""
+
+st.markdown(build_page_head(), unsafe_allow_html=True)
 
 # Sidebar with improved contrast headers
 with st.sidebar:
@@ -332,158 +530,154 @@ with st.sidebar:
     </div>
     """, unsafe_allow_html=True)
     
-    current_dataset = st.radio(
+    # Bound to st.session_state.current_dataset through its key
+    st.radio(
         "Select dataset:",
         options=["Dataset 1", "Dataset 2", "Dataset 3"],
-        index=["Dataset 1", "Dataset 2", "Dataset 3"].index(st.session_state.current_dataset),
+        key='current_dataset',
         label_visibility="collapsed"
     )
-    st.session_state.current_dataset = current_dataset
     
-    st.markdown(f"""
-    <div style="background-color:{WHITE}; padding:10px; border-radius:4px; margin-bottom:15px; border: 1px solid {BLACK}">
-        <h3 style="color:{BLACK}; margin:0;">Pipeline Parameters</h3>
-        <p style="color:{BLACK}; margin:0;">Current: <strong>{st.session_state.current_dataset}</strong></p>
-    </div>
-    """, unsafe_allow_html=True)
+    st.markdown(PARAMETER_PANEL_TEMPLATE.substitute(dataset=st.session_state.current_dataset),
+                unsafe_allow_html=True)
+    
+    # Parameter widgets only reach the script when the form is submitted
+    with st.form("pipeline_params"):
+        # Each widget is keyed by its inputs entry, so the values are read back
+        # from session state in one pass below
+        with st.expander("📏 Dimensional Parameters", expanded=True):
+            st.number_input('Pipe Thickness, t (mm)', min_value=0.1, value=10.0, key='pipe_thickness')
+            st.number_input('Pipe Diameter, D (mm)', min_value=0.1, value=200.0, key='pipe_diameter')
+            st.number_input('Pipe Length, L (mm)', min_value=0.1, value=1000.0, key='pipe_length')
+            st.number_input('Corrosion Length, Lc (mm)', min_value=0.0, value=50.0, key='corrosion_length')
+            st.number_input('Corrosion Depth, Dc (mm)', min_value=0.0, max_value=10.0, value=2.0, key='corrosion_depth')
     
-    with st.expander("📏 Dimensional Parameters", expanded=True):
-        inputs = {
-            'pipe_thickness': st.number_input('Pipe Thickness, t (mm)', min_value=0.1, value=10.0),
-            'pipe_diameter': st.number_input('Pipe Diameter, D (mm)', min_value=0.1, value=200.0),
-            'pipe_length': st.number_input('Pipe Length, L (mm)', min_value=0.1, value=1000.0),
-            'corrosion_length': st.number_input('Corrosion Length, Lc (mm)', min_value=0.0, value=50.0),
-            'corrosion_depth': st.number_input('Corrosion Depth, Dc (mm)', min_value=0.0, max_value=10.0, value=2.0)
-        }
-    
-    with st.expander("🧱 Material Properties", expanded=True):
-        inputs['yield_stress'] = st.number_input('Yield Stress, Sy (MPa)', min_value=0.1, value=300.0)
-        inputs['uts'] = st.number_input('Ultimate Tensile Strength, UTS (MPa)', min_value=0.1, value=400.0)
-    
-    with st.expander("📊 Operating Conditions", expanded=True):
-        inputs['max_pressure'] = st.slider('Max Operating Pressure (MPa)', 0, 50, 10)
-        inputs['min_pressure'] = st.slider('Min Operating Pressure (MPa)', 0, 50, 5)
+        with st.expander("🧱 Material Properties", expanded=True):
+            st.number_input('Yield Stress, Sy (MPa)', min_value=0.1, value=300.0, key='yield_stress')
+            st.number_input('Ultimate Tensile Strength, UTS (MPa)', min_value=0.1, value=400.0, key='uts')
+    
+        with st.expander("📊 Operating Conditions", expanded=True):
+            st.slider('Max Operating Pressure (MPa)', 0, 50, 10, key='max_pressure')
+            st.slider('Min Operating Pressure (MPa)', 0, 50, 5, key='min_pressure')
         
-    with st.expander("📈 Corrosion Growth", expanded=True):
-        inputs['inspection_year'] = st.number_input('Inspection Year', min_value=1900, max_value=2100, value=2023)
-        inputs['radial_corrosion_rate'] = st.slider('Radial Corrosion Rate (mm/year)', 0.01, 2.0, 0.1, 0.01)
-        inputs['axial_corrosion_rate'] = st.slider('Axial Corrosion Rate (mm/year)', 0.01, 2.0, 0.1, 0.01)
-        inputs['projection_years'] = st.slider('Projection Period (years)', 1, 50, 20, 1)
+        with st.expander("📈 Corrosion Growth", expanded=True):
+            st.number_input('Inspection Year', min_value=1900, max_value=2100, value=2023, key='inspection_year')
+            st.slider('Radial Corrosion Rate (mm/year)', 0.01, 2.0, 0.1, 0.01, key='radial_corrosion_rate')
+            st.slider('Axial Corrosion Rate (mm/year)', 0.01, 2.0, 0.1, 0.01, key='axial_corrosion_rate')
+            st.slider('Projection Period (years)', 1, 50, 20, 1, key='projection_years')
     
-    st.markdown("---")
-    st.markdown(f"""
-    <div style="background-color:{WHITE}; padding:10px; border-radius:4px; margin-top:15px; border: 1px solid {BLACK}">
-        <h4 style="color:{BLACK}; margin:0;">Safety Indicators</h4>
-        <p style="color:{MEDIUM_GRAY}; margin:0;">✅ Safe: Value ≤ 1<br>❌ Unsafe: Value > 1</p>
-    </div>
-    """, unsafe_allow_html=True)
+        st.markdown("---")
+        st.markdown(f"""
+        <div style="background-color:{WHITE}; padding:10px; border-radius:4px; margin-top:15px; border: 1px solid {BLACK}">
+            <h4 style="color:{BLACK}; margin:0;">Safety Indicators</h4>
+            <p style="color:{MEDIUM_GRAY}; margin:0;">✅ Safe: Value ≤ 1<br>❌ Unsafe: Value > 1</p>
+        </div>
+        """, unsafe_allow_html=True)
 
-    col1, col2 = st.columns(2)
-    with col1:
-        if st.button('Run Analysis', use_container_width=True, type="primary"):
-            st.session_state.run_analysis = True
-            # Store inputs for current dataset
-            st.session_state.datasets[st.session_state.current_dataset]['inputs'] = inputs
-            # Clear results to force recalculation
-            st.session_state.datasets[st.session_state.current_dataset]['results'] = None
-    
-    with col2:
-        if st.button('Reset All', use_container_width=True):
-            st.session_state.run_analysis = False
-            # Reset all datasets
-            for key in st.session_state.datasets:
-                st.session_state.datasets[key] = {'inputs': None, 'results': None}
+        submitted = st.form_submit_button('Run Analysis', use_container_width=True, type="primary")
+    
+    # Reset sits outside the form so clicking it does not also submit pending
+    # parameter edits - session state keeps the last submitted values
+    st.button('Reset All', use_container_width=True, on_click=reset_all_datasets)
+    
+    inputs = {key: st.session_state[key] for key in INPUT_KEYS}
+    
+    if submitted:
+        st.session_state.run_analysis = True
+        # Store inputs for current dataset
+        st.session_state.datasets[st.session_state.current_dataset]['inputs'] = inputs
+        # Clear results to force recalculation
+        st.session_state.datasets[st.session_state.current_dataset]['results'] = None
+
+# Remote images are fetched at most once a day and served from memory;
+# if the host is unreachable or answers with something other than an image
+# the URL is returned so the browser loads it directly
+@st.cache_data(ttl=86400, show_spinner=False)
+def load_remote_image(url):
+    try:
+        with urllib.request.urlopen(url, timeout=5) as response:
+            if not response.headers.get_content_type().startswith("image/"):
+                return url
+            return response.read()
+    except (OSError, http.client.HTTPException, ValueError):
+        return url
 
 # Image and intro section
 st.subheader('Pipeline Configuration')
 col1, col2 = st.columns([1, 2])
 with col1:
-    st.image("https://www.researchgate.net/profile/Changqing-Gong/publication/313456917/figure/fig1/AS:573308992266241@1513698923813/Schematic-illustration-of-the-geometry-of-a-typical-corrosion-defect.png", 
+    st.image(load_remote_image(DEFECT_GEOMETRY_IMAGE_URL), 
              caption="Fig. 1: Corrosion defect geometry")
 with col2:
-    st.markdown(f"""
-    <div class="material-card">
-        <h4 style="border-bottom: 1px solid {BLACK}; padding-bottom: 5px;">Assessment Protocol</h4>
-        <ol>
-            <li>Select dataset to configure</li>
-            <li>Enter pipeline dimensions and material properties</li>
-            <li>Specify operating pressure range</li>
-            <li>Click "Run Analysis" to perform assessment</li>
-            <li>Review burst pressure calculations</li>
-            <li>Analyze stress and fatigue results</li>
-            <li>Compare multiple datasets on fatigue diagram</li>
-        </ol>
-        <div class="progress-container">
-            <div class="progress-bar" style="width: {'50%' if st.session_state.get('run_analysis', False) else '10%'};"></div>
-        </div>
-        <p style="text-align: right; margin:0; color:{BLACK};">Status: {'Analysis Complete' if st.session_state.get('run_analysis', False) else 'Ready for Input'}</p>
-    </div>
-    """, unsafe_allow_html=True)
+    analysis_done = st.session_state.get('run_analysis', False)
+    st.markdown(PROTOCOL_CARD_TEMPLATE.substitute(
+        width='50%' if analysis_done else '10%',
+        status='Analysis Complete' if analysis_done else 'Ready for Input'
+    ), unsafe_allow_html=True)
 
-# Calculations
-def calculate_pressures(inputs):
-    t = inputs['pipe_thickness']
-    D = inputs['pipe_diameter']
-    Lc = inputs['corrosion_length']
-    Dc = inputs['corrosion_depth']
-    UTS = inputs['uts']
-    Sy = inputs['yield_stress']
+SQRT3 = math.sqrt(3)
+INV_SQRT3 = 1 / SQRT3
+SQRT3_OVER_4 = SQRT3 / 4
+
+# Corroded pipe burst pressures (ASME B31G, DNV, PCORRC) as NumPy expressions,
+# so the defect length Lc and depth Dc can be scalars or arrays of defects.
+# Both ASME length regimes are evaluated and selected with np.where
+def corroded_burst_pressures(t, D, Lc, Dc, UTS):
+    # Shared subexpressions: intact (Tresca) pressure, relative depth and the
+    # remaining wall fraction
+    k = 2 * t * UTS / D
+    r = Dc / t
+    wall = 1 - r
+    
+    # Folias (M) and DNV (Q) factors share Lc²/(D·t)
+    Lc2_Dt = Lc * Lc / (D * t)
+    M = np.sqrt(1 + 0.8 * Lc2_Dt)  # Folias factor
+    Q = np.sqrt(1 + 0.31 * Lc2_Dt)
+    
+    # Lc <= sqrt(20·D·t), compared squared (Lc >= 0) to avoid the square root
+    P_asme = np.where(
+        Lc * Lc <= 20 * D * t,
+        k * ((1 - (2/3) * r) / (1 - (2/3) * r / M)),
+        k * wall
+    )
+    P_dnv = (2 * UTS * t / (D - t)) * (wall / (1 - r / Q))
+    P_pcorrc = k * wall
     
+    return P_asme, P_dnv, P_pcorrc
+
+# Calculations - pure functions of scalar inputs
+def calculate_pressures(t, D, Lc, Dc, UTS):
     # Validate inputs to prevent division by zero
     if t <= 0 or D <= 0:
         raise ValueError("Pipe thickness and diameter must be positive values")
     
     # Intact pipe burst pressures
-    P_vm = (4 * t * UTS) / (math.sqrt(3) * D)
-    P_tresca = (2 * t * UTS) / D
-    
-    # Corroded pipe burst pressures
-    M = math.sqrt(1 + 0.8 * (Lc**2 / (D * t)))  # Folias factor
+    P_tresca = 2 * t * UTS / D
+    P_vm = 2 * P_tresca * INV_SQRT3
     
-    if Lc <= math.sqrt(20 * D * t):
-        P_asme = (2 * t * UTS / D) * ((1 - (2/3) * (Dc/t)) / (1 - (2/3) * (Dc/t) / M))
-    else:
-        P_asme = (2 * t * UTS / D) * (1 - (Dc/t))
+    # No defect length or depth: M = Q = 1 and the defect ratios cancel, so the
+    # Folias/DNV factors are skipped (PCORRC still scales with the remaining wall)
+    if Lc == 0 or Dc == 0:
+        return np.array([P_vm, P_tresca, P_tresca, 2 * UTS * t / (D - t), P_tresca * (1 - Dc/t)])
     
-    Q = math.sqrt(1 + 0.31 * (Lc**2) / (D * t)))
-    P_dnv = (2 * UTS * t / (D - t)) * ((1 - (Dc/t)) / (1 - (Dc/(t * Q))))
-    P_pcorrc = (2 * t * UTS / D) * (1 - Dc/t)
+    P_asme, P_dnv, P_pcorrc = corroded_burst_pressures(t, D, Lc, Dc, UTS)
     
-    return {
-        'P_vm': P_vm,
-        'P_tresca': P_tresca,
-        'P_asme': P_asme,
-        'P_dnv': P_dnv,
-        'P_pcorrc': P_pcorrc
-    }
+    # Ordered as BURST_NAMES
+    return np.array([P_vm, P_tresca, P_asme, P_dnv, P_pcorrc])
 
-def calculate_stresses(inputs):
-    t = inputs['pipe_thickness']
-    D = inputs['pipe_diameter']
-    Pop_max = inputs['max_pressure']
-    Pop_min = inputs['min_pressure']
-    UTS = inputs['uts']
-    Sy = inputs['yield_stress']
-    
-    # Principal stresses
-    P1_max = Pop_max * D / (2 * t)
-    P2_max = Pop_max * D / (4 * t)
-    P3_max = 0
-    
-    P1_min = Pop_min * D / (2 * t)
-    P2_min = Pop_min * D / (4 * t)
-    P3_min = 0
-    
-    # Von Mises stresses
-    def vm_stress(p1, p2, p3):
-        return (1/math.sqrt(2)) * math.sqrt((p1-p2)**2 + (p2-p3)**2 + (p3-p1)**2)
-    
-    sigma_vm_max = vm_stress(P1_max, P2_max, P3_max)
-    sigma_vm_min = vm_stress(P1_min, P2_min, P3_min)
-    
-    # Fatigue parameters
-    sigma_a = (sigma_vm_max - sigma_vm_min) / 2
-    sigma_m = (sigma_vm_max + sigma_vm_min) / 2
+def calculate_stresses(t, D, Pop_max, Pop_min, UTS):
+    # Von Mises stresses - with hoop stress P1 = P·D/(2t), axial P2 = P1/2 and
+    # radial P3 = 0, (1/√2)·√((P1-P2)² + (P2-P3)² + (P3-P1)²) reduces to
+    # P1·√3/2 = P·(√3/4)·D/t, a single factor of the pressure. Keep this exact
+    # closed form rather than the general three-stress expression
+    vm_per_pressure = SQRT3_OVER_4 * D / t
+    sigma_vm_max = Pop_max * vm_per_pressure
+    sigma_vm_min = Pop_min * vm_per_pressure
+    
+    # Fatigue parameters - the stress is linear in pressure, so amplitude and
+    # mean come straight from the pressure range
+    sigma_a = (Pop_max - Pop_min) / 2 * vm_per_pressure
+    sigma_m = (Pop_max + Pop_min) / 2 * vm_per_pressure
     Se = 0.5 * UTS
     sigma_f = UTS + 345  # Morrow's fatigue strength coefficient
     
@@ -497,82 +691,252 @@ def calculate_stresses(inputs):
     }
 
 def calculate_fatigue_criteria(sigma_a, sigma_m, Se, UTS, Sy, sigma_f):
+    # Each stress ratio is computed once and shared between the criteria
+    ra = sigma_a / Se
+    rm_uts = sigma_m / UTS
+    rm_sy = sigma_m / Sy
+    
+    # Ordered as FATIGUE_CRITERIA
+    return np.array([
+        ra + rm_uts,                # Goodman
+        ra + rm_sy,                 # Soderberg
+        ra + rm_uts * rm_uts,       # Gerber
+        ra + sigma_m / sigma_f,     # Morrow
+        math.hypot(ra, rm_sy)       # ASME-Elliptic
+    ])
+
+# Burst, stress and fatigue results of one dataset, memoized with st.cache_data
+@st.cache_data(max_entries=64, show_spinner=False)
+def calculate_results(t, D, Lc, Dc, UTS, Sy, Pop_max, Pop_min):
+    stresses = calculate_stresses(t, D, Pop_max, Pop_min, UTS)
     return {
-        'Goodman': (sigma_a / Se) + (sigma_m / UTS),
-        'Soderberg': (sigma_a / Se) + (sigma_m / Sy),
-        'Gerber': (sigma_a / Se) + (sigma_m / UTS)**2,
-        'Morrow': (sigma_a / Se) + (sigma_m / sigma_f),
-        'ASME-Elliptic': np.sqrt((sigma_a / Se)**2 + (sigma_m / Sy)**2)
+        'pressures': calculate_pressures(t, D, Lc, Dc, UTS),
+        'stresses': stresses,
+        'fatigue': calculate_fatigue_criteria(
+            stresses['sigma_a'], stresses['sigma_m'],
+            stresses['Se'], UTS, Sy, stresses['sigma_f']
+        )
     }
 
-# FFS Assessment with corrosion growth projection
-def calculate_ffs_assessment(inputs, current_depth, current_length):
-    results = []
+# FFS Assessment with corrosion growth projection - cached on its scalar
+# inputs like calculate_results, so reruns with unchanged parameters (dataset
+# switches, expanders) reuse the projection
+@st.cache_data(max_entries=64, show_spinner=False)
+def calculate_ffs_assessment(t, D, UTS, Pop_max, inspection_year, projection_years,
+                             current_depth, current_length, radial_rate, axial_rate):
+    # Every projection year is evaluated at once as NumPy columns
+    year = np.arange(inspection_year, inspection_year + projection_years + 1)
+    years_elapsed = year - inspection_year
+    
+    # Corrosion growth, with depth capped at 80% wall thickness
+    d = np.minimum(current_depth + radial_rate * years_elapsed, t * 0.8)
+    L = current_length + axial_rate * years_elapsed
+    
+    # Burst pressures of the grown defect for every year in one kernel call
+    P_asme, P_dnv, P_pcorrc = corroded_burst_pressures(t, D, L, d, UTS)
+    
+    # Calculate ERF (Estimated Repair Factor)
+    erf_asme = Pop_max / P_asme
+    erf_dnv = Pop_max / P_dnv
+    erf_pcorrc = Pop_max / P_pcorrc
+    
+    # Record results as columns, with the critical (largest) ERF per year
+    results = {
+        'year': year,
+        'depth': d,
+        'length': L,
+        'P_asme': P_asme,
+        'P_dnv': P_dnv,
+        'P_pcorrc': P_pcorrc,
+        'erf_asme': erf_asme,
+        'erf_dnv': erf_dnv,
+        'erf_pcorrc': erf_pcorrc,
+        'critical_erf': np.maximum(np.maximum(erf_asme, erf_dnv), erf_pcorrc)
+    }
+    
+    # Track failure years - the first year each ERF reaches 1
     failure_years = {}
+    for method, erf in (('ASME', erf_asme), ('DNV', erf_dnv), ('PCORRC', erf_pcorrc)):
+        failed = erf >= 1.0
+        if failed.any():
+            failure_years[method] = int(year[failed.argmax()])
     
-    for year in range(inputs['inspection_year'], 
-                     inputs['inspection_year'] + inputs['projection_years'] + 1):
-        # Calculate corrosion growth
-        years_elapsed = year - inputs['inspection_year']
-        d = current_depth + inputs['radial_corrosion_rate'] * years_elapsed
-        L = current_length + inputs['axial_corrosion_rate'] * years_elapsed
-        
-        # Cap depth at 80% wall thickness
-        d = min(d, inputs['pipe_thickness'] * 0.8)
-        
-        # Calculate burst pressures
-        t = inputs['pipe_thickness']
-        D = inputs['pipe_diameter']
-        UTS = inputs['uts']
-        Sy = inputs['yield_stress']
-        
-        # Folias factor
-        M = math.sqrt(1 + 0.8 * (L**2 / (D * t)))
-        
-        # ASME model
-        if L <= math.sqrt(20 * D * t):
-            P_asme = (2 * t * UTS / D) * ((1 - (2/3) * (d/t)) / (1 - (2/3) * (d/t) / M))
-        else:
-            P_asme = (2 * t * UTS / D) * (1 - (d/t))
-        
-        # DNV model
-        Q = math.sqrt(1 + 0.31 * (L**2) / (D * t)))
-        P_dnv = (2 * UTS * t / (D - t)) * ((1 - (d/t)) / (1 - (d/(t * Q))))
+    return results, failure_years
+
+# Gather the stored results of all datasets into column arrays (NaN where a
+# dataset has not been analysed yet), so the combined views read whole columns
+def collect_dataset_results(datasets):
+    n = len(datasets)
+    collected = {
+        'names': list(datasets),
+        'analysed': np.zeros(n, dtype=bool),
+        'sigma_m': np.full(n, np.nan),
+        'sigma_a': np.full(n, np.nan),
+        'fatigue': np.full((n, len(FATIGUE_CRITERIA)), np.nan)
+    }
+    
+    for i, dataset in enumerate(datasets.values()):
+        if dataset['results']:
+            collected['analysed'][i] = True
+            collected['sigma_m'][i] = dataset['results']['stresses']['sigma_m']
+            collected['sigma_a'][i] = dataset['results']['stresses']['sigma_a']
+            collected['fatigue'][i] = dataset['results']['fatigue']
+    
+    return collected
+
+# Per-session burst projection chart - the figure, both axes, their styling and
+# every line are created once; later reruns only swap the line data and rescale.
+# The figure is owned by the session state alone
+def projection_figure():
+    key = 'figure_burst_projection'
+    if key not in st.session_state:
+        fig = Figure(figsize=(10, 6))
+        ax1 = fig.subplots()
+        ax2 = ax1.twinx()
+        fig.patch.set_facecolor(WHITE)
         
-        # PCORRC model
-        P_pcorrc = (2 * t * UTS / D) * (1 - d/t)
+        # Burst Pressure Plot
+        pressure_lines = (
+            ax1.plot([], [], label='ASME B31G', color=COLORS['Goodman'], linestyle='-', linewidth=2)[0],
+            ax1.plot([], [], label='DNV-RP-F101', color=COLORS['Soderberg'], linestyle='--', linewidth=2)[0],
+            ax1.plot([], [], label='PCORRC', color=COLORS['Gerber'], linestyle='-.', linewidth=2)[0]
+        )
+        maop_line = ax1.axhline(y=0, color=RED, linestyle=':', linewidth=2.5, label='MAOP')
+        ax1.set_xlabel('Year', fontsize=10, color=BLACK)
+        ax1.set_ylabel('Burst Pressure (MPa)', fontsize=10, color=BLACK)
+        ax1.tick_params(axis='y', colors=BLACK)
+        ax1.grid(True, linestyle='--', alpha=0.7, color=MEDIUM_GRAY)
         
-        # Calculate ERF (Estimated Repair Factor)
-        erf_asme = inputs['max_pressure'] / P_asme
-        erf_dnv = inputs['max_pressure'] / P_dnv
-        erf_pcorrc = inputs['max_pressure'] / P_pcorrc
+        # ERF Plot (secondary axis)
+        erf_line, = ax2.plot([], [], label='Critical ERF', color=BLACK, linewidth=3)
+        ax2.axhline(y=1.0, color=RED, linestyle='-', linewidth=2, label='Failure Threshold')
+        ax2.set_ylabel('ERF (MAOP/Burst Pressure)', fontsize=10, color=BLACK)
+        ax2.tick_params(axis='y', colors=BLACK)
         
-        # Determine critical ERF
-        critical_erf = max(erf_asme, erf_dnv, erf_pcorrc)
+        # Formatting
+        ax1.set_title('Burst Pressure Projection and ERF', fontsize=12, fontweight='bold', color=BLACK)
+        lines1, labels1 = ax1.get_legend_handles_labels()
+        lines2, labels2 = ax2.get_legend_handles_labels()
+        ax1.legend(lines1 + lines2, labels1 + labels2, loc='upper right', facecolor=WHITE, edgecolor=BLACK)
         
-        # Record results
-        results.append({
-            'year': year,
-            'depth': d,
-            'length': L,
-            'P_asme': P_asme,
-            'P_dnv': P_dnv,
-            'P_pcorrc': P_pcorrc,
-            'erf_asme': erf_asme,
-            'erf_dnv': erf_dnv,
-            'erf_pcorrc': erf_pcorrc,
-            'critical_erf': critical_erf
-        })
+        # Set axis colors
+        for ax in [ax1, ax2]:
+            ax.spines['bottom'].set_color(BLACK)
+            ax.spines['top'].set_color(BLACK)
+            ax.spines['right'].set_color(BLACK)
+            ax.spines['left'].set_color(BLACK)
         
-        # Track failure years
-        if erf_asme >= 1.0 and 'ASME' not in failure_years:
-            failure_years['ASME'] = year
-        if erf_dnv >= 1.0 and 'DNV' not in failure_years:
-            failure_years['DNV'] = year
-        if erf_pcorrc >= 1.0 and 'PCORRC' not in failure_years:
-            failure_years['PCORRC'] = year
+        st.session_state[key] = (fig, (ax1, ax2), pressure_lines, maop_line, erf_line)
     
-    return results, failure_years
+    return st.session_state[key]
+
+# Figures are sent to the browser as SVG text
+def figure_svg(fig):
+    buf = io.StringIO()
+    fig.savefig(buf, format='svg', bbox_inches='tight')
+    return buf.getvalue()
+
+# Reference curves of the five criteria (FATIGUE_CRITERIA order) over the x grid,
+# written row by row into one preallocated (5, n) array with in-place ufuncs so
+# no per-curve temporaries are created
+def fatigue_curves(x, Se, UTS, Sy, sigma_f):
+    curves = np.empty((len(FATIGUE_CRITERIA), x.size), dtype=x.dtype)
+    goodman, soderberg, gerber, morrow, elliptic = curves
+    
+    np.divide(x, UTS, out=goodman)
+    np.multiply(goodman, goodman, out=gerber)
+    np.divide(x, Sy, out=soderberg)
+    np.multiply(soderberg, soderberg, out=elliptic)
+    np.divide(x, sigma_f, out=morrow)
+    
+    np.subtract(1, curves, out=curves)
+    # Ellipse only exists up to Sy: take the root on that part and leave NaN
+    # beyond it (undrawn by Matplotlib, no invalid-value warning)
+    inside = elliptic >= 0
+    np.sqrt(elliptic, out=elliptic, where=inside)
+    elliptic[~inside] = np.nan
+    curves *= Se
+    return curves
+
+# x grid and reference curves depend only on the material values, so they are
+# computed once per (Se, UTS, Sy, sigma_f) and reused when only the operating
+# points change (float32 is plenty for plot data; reported values stay float64).
+# Sy and UTS are added to the grid so the ellipse and the Goodman/Gerber lines
+# end exactly on the axis where their slopes are steepest
+FATIGUE_CURVE_SAMPLES = 64
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def fatigue_reference_curves(Se, UTS, Sy, sigma_f):
+    x_max = UTS*1.1
+    x = np.linspace(0, x_max, FATIGUE_CURVE_SAMPLES, dtype=np.float32)
+    x = np.union1d(x, np.float32([value for value in (Sy, UTS) if value <= x_max]))
+    return x, fatigue_curves(x, Se, UTS, Sy, sigma_f)
+
+# Fatigue diagram rendering - cached as SVG text so reruns with unchanged
+# inputs skip the Matplotlib pipeline entirely (vector output, no rasterization)
+@st.cache_data(max_entries=64, show_spinner=False)
+def render_fatigue_diagram(reference, operating_points):
+    Se, UTS, Sy, sigma_f = reference
+    
+    fig = Figure(figsize=(10, 6))
+    ax = fig.subplots()
+    fig.patch.set_facecolor(WHITE)
+    
+    x, curves = fatigue_reference_curves(Se, UTS, Sy, sigma_f)
+    
+    # Plot all criteria in one call (one line per column of curves.T), then give
+    # each line its color, line style and label
+    lines = ax.plot(x, curves.T, linewidth=2.5)
+    for line, name, color, linestyle in zip(lines, FATIGUE_CRITERIA, FATIGUE_COLORS, FATIGUE_LINESTYLES):
+        line.set(color=color, linestyle=linestyle, label=name)
+    
+    # Plot operating points for all datasets
+    markers = ['o', 's', 'D']  # Circle, Square, Diamond
+    for i, dataset_name, sigma_m, sigma_a in operating_points:
+        ax.scatter(sigma_m, sigma_a, 
+                  color=DATASET_COLORS[i], s=150, edgecolor='black', zorder=10,
+                  marker=markers[i], label=f'{dataset_name} (σm={sigma_m:.1f}, σa={sigma_a:.1f})')
+    
+    # Mark key points with consistent style
+    ax.scatter(0, Se, color=COLORS['KeyPoints'], s=100, marker='o', 
+              label=f'Se = {Se:.1f} MPa')
+    ax.scatter(UTS, 0, color=COLORS['KeyPoints'], s=100, marker='s', 
+              label=f'UTS = {UTS:.1f} MPa')
+    ax.scatter(Sy, 0, color=COLORS['KeyPoints'], s=100, marker='^', 
+              label=f'Sy = {Sy:.1f} MPa')
+    
+    # Formatting with high contrast - handle incomplete datasets
+    max_x = UTS * 1.1
+    max_y = Se * 1.5
+    
+    # Use all operating points to determine axis limits
+    all_points = [value for _, _, sigma_m, sigma_a in operating_points for value in (sigma_m, sigma_a)]
+    
+    if all_points:
+        max_x = max(max_x, max(all_points) * 1.2)
+        max_y = max(max_y, max(all_points) * 1.5)
+    
+    ax.set_xlim(0, max_x)
+    ax.set_ylim(0, max_y)
+    ax.set_xlabel('Mean Stress (σm) [MPa]', fontsize=10, color=BLACK)
+    ax.set_ylabel('Alternating Stress (σa) [MPa]', fontsize=10, color=BLACK)
+    ax.set_title('Fatigue Analysis Diagram', fontsize=12, fontweight='bold', color=BLACK)
+    ax.grid(True, linestyle='--', alpha=0.7, color=MEDIUM_GRAY)
+    ax.set_facecolor(WHITE)
+    
+    # Set axis and tick colors to black
+    ax.spines['bottom'].set_color(BLACK)
+    ax.spines['top'].set_color(BLACK) 
+    ax.spines['right'].set_color(BLACK)
+    ax.spines['left'].set_color(BLACK)
+    ax.tick_params(axis='x', colors=BLACK)
+    ax.tick_params(axis='y', colors=BLACK)
+    
+    # Create custom legend
+    ax.legend(loc='upper right', bbox_to_anchor=(1.35, 1), fontsize=9, facecolor=WHITE, edgecolor=BLACK)
+    fig.tight_layout()
+    
+    return figure_svg(fig)
 
 # Main analysis section
 if st.session_state.get('run_analysis', False):
@@ -581,384 +945,193 @@ if st.session_state.get('run_analysis', False):
     
     if current_data['inputs'] is not None:
         try:
-            # Calculate all parameters
-            pressures = calculate_pressures(current_data['inputs'])
-            stresses = calculate_stresses(current_data['inputs'])
-            fatigue = calculate_fatigue_criteria(
-                stresses['sigma_a'], stresses['sigma_m'],
-                stresses['Se'], current_data['inputs']['uts'], 
-                current_data['inputs']['yield_stress'],
-                stresses['sigma_f']
-            )
-            
-            # Store results
-            current_data['results'] = {
-                'pressures': pressures,
-                'stresses': stresses,
-                'fatigue': fatigue
-            }
-            
-            # Get current corrosion parameters
-            current_depth = current_data['inputs']['corrosion_depth']
-            current_length = current_data['inputs']['corrosion_length']
+            # Calculate all parameters - only when the dataset's inputs were (re)submitted,
+            # which clears its results; other reruns reuse what is stored in the session
+            if current_data['results'] is None:
+                dataset_inputs = current_data['inputs']
+                results = calculate_results(
+                    dataset_inputs['pipe_thickness'], dataset_inputs['pipe_diameter'],
+                    dataset_inputs['corrosion_length'], dataset_inputs['corrosion_depth'],
+                    dataset_inputs['uts'], dataset_inputs['yield_stress'],
+                    dataset_inputs['max_pressure'], dataset_inputs['min_pressure']
+                )
+                # FFS assessment from the current corrosion parameters
+                results['ffs'] = calculate_ffs_assessment(
+                    dataset_inputs['pipe_thickness'], dataset_inputs['pipe_diameter'],
+                    dataset_inputs['uts'], dataset_inputs['max_pressure'],
+                    dataset_inputs['inspection_year'], dataset_inputs['projection_years'],
+                    dataset_inputs['corrosion_depth'], dataset_inputs['corrosion_length'],
+                    dataset_inputs['radial_corrosion_rate'], dataset_inputs['axial_corrosion_rate']
+                )
+                current_data['results'] = results
             
-            # Calculate FFS assessment
-            ffs_results, failure_years = calculate_ffs_assessment(
-                current_data['inputs'], 
-                current_depth, 
-                current_length
-            )
+            pressures = current_data['results']['pressures']
+            stresses = current_data['results']['stresses']
+            fatigue = current_data['results']['fatigue']
+            ffs_results, failure_years = current_data['results']['ffs']
             
             # Burst Pressure Results in Card Layout
-            st.markdown(f"""
-<div class="section-header">
-    <h3 style="margin:0;">📊 Burst Pressure Assessment ({st.session_state.current_dataset})</h3>
-</div>
-""", unsafe_allow_html=True)
+            st.markdown(SECTION_HEADER_TEMPLATE.substitute(
+                title=f"📊 Burst Pressure Assessment ({st.session_state.current_dataset})"
+            ), unsafe_allow_html=True)
             
-            burst_cols = st.columns(5)
-            burst_data = [
-                ("Von Mises", pressures['P_vm'], BLACK),
-                ("Tresca", pressures['P_tresca'], MEDIUM_GRAY),
-                ("ASME B31G", pressures['P_asme'], DARK_GRAY),
-                ("DNV", pressures['P_dnv'], ACCENT),
-                ("PCORRC", pressures['P_pcorrc'], BLACK)
-            ]
+            # Values and progress-bar widths for all cards in one vectorized pass (10 MPa = full bar)
+            burst_values = np.char.mod("%.2f", pressures)
+            burst_widths = np.clip(pressures * 10, 0, 100)
             
-            for i, (name, value, color) in enumerate(burst_data):
-                with burst_cols[i]:
-                    st.markdown(f"""
-                    <div class="card" style="border-left: 4px solid {color};">
-                        <h4 style="margin-top: 0;">{name}</h4>
-                        <div class="value-display">{value:.2f} MPa</div>
-                        <div style="height: 4px; background: {LIGHT_GRAY}; margin: 10px 0;">
-                            <div style="height: 4px; background: {color}; width: {min(100, value/10*100)}%;"></div>
-                        </div>
-                    </div>
-                    """, unsafe_allow_html=True)
+            # All five cards in one grid element
+            burst_cards = "".join(
+                BURST_CARD_TEMPLATE.substitute(name=name, value=value, color=color, width=width)
+                for name, value, color, width in zip(BURST_NAMES, burst_values, BURST_COLORS, burst_widths)
+            )
+            st.markdown(f'<div class="card-grid">{burst_cards}</div>', unsafe_allow_html=True)
             
             # FFS Assessment Section
-            st.markdown(f"""
-<div class="section-header">
-    <h3 style="margin:0;">⏳ Fitness-for-Service Assessment ({st.session_state.current_dataset})</h3>
-</div>
-""", unsafe_allow_html=True)
-            
-            # Create DataFrame for display
-            df = pd.DataFrame(ffs_results)
+            st.markdown(SECTION_HEADER_TEMPLATE.substitute(
+                title=f"⏳ Fitness-for-Service Assessment ({st.session_state.current_dataset})"
+            ), unsafe_allow_html=True)
             
             # Display failure predictions
             metric_cols = st.columns(3)
             with metric_cols[0]:
-                st.markdown(f"""
-                <div class="material-card">
-                    <h4>Current Year</h4>
-                    <div style="font-size: 2rem; font-weight: bold; text-align: center; color: {BLACK};">{current_data['inputs']['inspection_year']}</div>
-                </div>
-                """, unsafe_allow_html=True)
-            
-            with metric_cols[1]:
-                asme_fail = failure_years.get('ASME', "Beyond projection")
-                st.markdown(f"""
-                <div class="material-card">
-                    <h4>ASME Failure Year</h4>
-                    <div style="font-size: 2rem; font-weight: bold; text-align: center; color: {'red' if asme_fail != "Beyond projection" else BLACK};">{asme_fail}</div>
-                </div>
-                """, unsafe_allow_html=True)
-            
-            with metric_cols[2]:
-                dnv_fail = failure_years.get('DNV', "Beyond projection")
-                st.markdown(f"""
-                <div class="material-card">
-                    <h4>DNV Failure Year</h4>
-                    <div style="font-size: 2rem; font-weight: bold; text-align: center; color: {'red' if dnv_fail != "Beyond projection" else BLACK};">{dnv_fail}</div>
-                </div>
-                """, unsafe_allow_html=True)
-            
-            # Plot burst pressure over time
-            fig, ax1 = plt.subplots(figsize=(10, 6))
-            fig.patch.set_facecolor(WHITE)
-            
-            # Burst Pressure Plot
-            ax1.plot(df['year'], df['P_asme'], label='ASME B31G', color=COLORS['Goodman'], linestyle='-', linewidth=2)
-            ax1.plot(df['year'], df['P_dnv'], label='DNV-RP-F101', color=COLORS['Soderberg'], linestyle='--', linewidth=2)
-            ax1.plot(df['year'], df['P_pcorrc'], label='PCORRC', color=COLORS['Gerber'], linestyle='-.', linewidth=2)
-            ax1.axhline(y=current_data['inputs']['max_pressure'], color=RED, linestyle=':', linewidth=2.5, label='MAOP')
-            ax1.set_xlabel('Year', fontsize=10, color=BLACK)
-            ax1.set_ylabel('Burst Pressure (MPa)', fontsize=10, color=BLACK)
-            ax1.tick_params(axis='y', colors=BLACK)
-            ax1.grid(True, linestyle='--', alpha=0.7, color=MEDIUM_GRAY)
-            
-            # ERF Plot (secondary axis)
-            ax2 = ax1.twinx()
-            ax2.plot(df['year'], df['critical_erf'], label='Critical ERF', color=BLACK, linewidth=3)
-            ax2.axhline(y=1.0, color=RED, linestyle='-', linewidth=2, label='Failure Threshold')
-            ax2.set_ylabel('ERF (MAOP/Burst Pressure)', fontsize=10, color=BLACK)
-            ax2.tick_params(axis='y', colors=BLACK)
+                st.markdown(METRIC_CARD_TEMPLATE.substitute(
+                    title="Current Year", value=current_data['inputs']['inspection_year'], color=BLACK
+                ), unsafe_allow_html=True)
             
-            # Formatting
-            ax1.set_title('Burst Pressure Projection and ERF', fontsize=12, fontweight='bold', color=BLACK)
-            lines1, labels1 = ax1.get_legend_handles_labels()
-            lines2, labels2 = ax2.get_legend_handles_labels()
-            ax1.legend(lines1 + lines2, labels1 + labels2, loc='upper right', facecolor=WHITE, edgecolor=BLACK)
+            for column, method in zip(metric_cols[1:], ('ASME', 'DNV')):
+                with column:
+                    fail_year = failure_years.get(method, "Beyond projection")
+                    st.markdown(METRIC_CARD_TEMPLATE.substitute(
+                        title=f"{method} Failure Year", value=fail_year,
+                        color=RED if method in failure_years else BLACK
+                    ), unsafe_allow_html=True)
             
-            # Set axis colors
-            for ax in [ax1, ax2]:
-                ax.spines['bottom'].set_color(BLACK)
-                ax.spines['top'].set_color(BLACK)
-                ax.spines['right'].set_color(BLACK)
-                ax.spines['left'].set_color(BLACK)
+            # Plot burst pressure over time on the session's projection chart
+            fig, axes, pressure_lines, maop_line, erf_line = projection_figure()
+            for line, column in zip(pressure_lines, ('P_asme', 'P_dnv', 'P_pcorrc')):
+                line.set_data(ffs_results['year'], ffs_results[column])
+            maop_line.set_ydata([current_data['inputs']['max_pressure']] * 2)
+            erf_line.set_data(ffs_results['year'], ffs_results['critical_erf'])
+            for ax in axes:
+                ax.relim()
+                ax.autoscale_view()
             
-            st.pyplot(fig)
+            st.image(figure_svg(fig))
             
             # Display detailed table
             with st.expander("Detailed Projection Data", expanded=False):
-                # Format columns
-                display_df = df.copy()
-                display_df['Depth'] = display_df['depth'].apply(lambda x: f"{x:.2f} mm")
-                display_df['Length'] = display_df['length'].apply(lambda x: f"{x:.2f} mm")
-                display_df['ASME Burst'] = display_df['P_asme'].apply(lambda x: f"{x:.2f} MPa")
-                display_df['DNV Burst'] = display_df['P_dnv'].apply(lambda x: f"{x:.2f} MPa")
-                display_df['PCORRC Burst'] = display_df['P_pcorrc'].apply(lambda x: f"{x:.2f} MPa")
-                display_df['Critical ERF'] = display_df['critical_erf'].apply(lambda x: f"{x:.3f}")
+                # Format columns straight from the result arrays - each one in a
+                # single vectorized pass; pandas is only needed for the styled view
+                display_df = pd.DataFrame({
+                    'year': ffs_results['year'],
+                    'Depth': np.char.mod("%.2f mm", ffs_results['depth']),
+                    'Length': np.char.mod("%.2f mm", ffs_results['length']),
+                    'ASME Burst': np.char.mod("%.2f MPa", ffs_results['P_asme']),
+                    'DNV Burst': np.char.mod("%.2f MPa", ffs_results['P_dnv']),
+                    'PCORRC Burst': np.char.mod("%.2f MPa", ffs_results['P_pcorrc']),
+                    'Critical ERF': np.char.mod("%.3f", ffs_results['critical_erf'])
+                })
                 
-                # Highlight failure years
-                def highlight_erf(val):
-                    erf = float(val)
-                    color = RED if erf >= 1.0 else BLACK
-                    weight = "bold" if erf >= 1.0 else "normal"
-                    return f'color: {color}; font-weight: {weight};'
+                # Highlight failure years - styles for the whole ERF column from one np.where
+                erf_styles = np.where(
+                    ffs_results['critical_erf'] >= 1.0,
+                    f'color: {RED}; font-weight: bold;',
+                    f'color: {BLACK}; font-weight: normal;'
+                )
                 
                 st.dataframe(
-                    display_df[['year', 'Depth', 'Length', 'ASME Burst', 'DNV Burst', 'PCORRC Burst', 'Critical ERF']]
-                    .style.applymap(highlight_erf, subset=['Critical ERF']),
+                    display_df.style.apply(lambda _: erf_styles, subset=['Critical ERF']),
                     height=300
                 )
             
             # Stress Analysis
-            st.markdown(f"""
-<div class="section-header">
-    <h3 style="margin:0;">📈 Stress Analysis ({st.session_state.current_dataset})</h3>
-</div>
-""", unsafe_allow_html=True)
+            st.markdown(SECTION_HEADER_TEMPLATE.substitute(
+                title=f"📈 Stress Analysis ({st.session_state.current_dataset})"
+            ), unsafe_allow_html=True)
             
             stress_col1, stress_col2 = st.columns([1, 1])
             
             with stress_col1:
-                st.markdown(f"""
-                <div class="material-card">
-                    <h4>Stress Parameters</h4>
-                    <table style="width:100%; border-collapse: collapse; font-size: 0.95rem;">
-                        <tr style="border-bottom: 1px solid {BLACK};">
-                            <td style="padding: 8px;">Max VM Stress</td>
-                            <td style="text-align: right; padding: 8px; font-weight: bold;">{stresses['sigma_vm_max']:.2f} MPa</td>
-                        </tr>
-                        <tr style="border-bottom: 1px solid {BLACK};">
-                            <td style="padding: 8px;">Min VM Stress</td>
-                            <td style="text-align: right; padding: 8px; font-weight: bold;">{stresses['sigma_vm_min']:.2f} MPa</td>
-                        </tr>
-                        <tr style="border-bottom: 1px solid {BLACK};">
-                            <td style="padding: 8px;">Alternating Stress</td>
-                            <td style="text-align: right; padding: 8px; font-weight: bold;">{stresses['sigma_a']:.2f} MPa</td>
-                        </tr>
-                        <tr style="border-bottom: 1px solid {BLACK};">
-                            <td style="padding: 8px;">Mean Stress</td>
-                            <td style="text-align: right; padding: 8px; font-weight: bold;">{stresses['sigma_m']:.2f} MPa</td>
-                        </tr>
-                        <tr>
-                            <td style="padding: 8px;">Endurance Limit</td>
-                            <td style="text-align: right; padding: 8px; font-weight: bold;">{stresses['Se']:.2f} MPa</td>
-                        </tr>
-                    </table>
-                </div>
-                """, unsafe_allow_html=True)
+                stress_cells = np.char.mod("%.2f", [stresses[key] for key in STRESS_TABLE_KEYS])
+                st.markdown(STRESS_TABLE_TEMPLATE.substitute(dict(zip(STRESS_TABLE_KEYS, stress_cells))),
+                            unsafe_allow_html=True)
             
             with stress_col2:
-                # Simple stress visualization with high contrast
-                fig, ax = plt.subplots(figsize=(6, 4))
-                categories = ['Max Stress', 'Min Stress', 'Amplitude']
-                values = [
-                    stresses['sigma_vm_max'],
-                    stresses['sigma_vm_min'],
-                    stresses['sigma_a']
-                ]
-                # Grayscale colors for bars
-                colors = ['#1f77b4', '#ff7f0e', '#2ca02c']  # Blue, Orange, Green
-                bars = ax.bar(categories, values, color=colors, edgecolor=BLACK)
-                
-                # Add value labels
-                for bar in bars:
-                    height = bar.get_height()
-                    ax.text(bar.get_x() + bar.get_width()/2., height,
-                            f'{height:.1f} MPa',
-                            ha='center', va='bottom', fontsize=9, color=BLACK)
-                
-                ax.set_ylim(0, max(values) * 1.2)
-                ax.set_title('Stress Distribution', fontsize=10, color=BLACK)
-                ax.grid(axis='y', linestyle='--', alpha=0.7, color=MEDIUM_GRAY)
-                ax.spines['top'].set_visible(False)
-                ax.spines['right'].set_visible(False)
-                ax.spines['left'].set_color(BLACK)
-                ax.spines['bottom'].set_color(BLACK)
-                ax.tick_params(axis='x', colors=BLACK)
-                ax.tick_params(axis='y', colors=BLACK)
-                ax.set_facecolor(WHITE)
-                plt.tight_layout()
-                st.pyplot(fig)
-            
-            # Fatigue Assessment with Safety Status
-            st.markdown(f"""
-<div class="section-header">
-    <h3 style="margin:0;">🛡️ Fatigue Assessment ({st.session_state.current_dataset})</h3>
+                # Simple stress visualization with high contrast, drawn as HTML bars
+                # scaled so the tallest reaches 1/1.2 of the plot height
+                categories = ('Max Stress', 'Min Stress', 'Amplitude')
+                colors = ('#1f77b4', '#ff7f0e', '#2ca02c')  # Blue, Orange, Green
+                values = np.array([stresses['sigma_vm_max'], stresses['sigma_vm_min'], stresses['sigma_a']])
+                peak = values.max() * 1.2
+                heights = values / peak * 100 if peak > 0 else np.zeros_like(values)
+                bars = "".join(
+                    f'<div class="bar-column"><div>{value:.1f} MPa</div>'
+                    f'<div class="bar" style="height:{height:.1f}%; background:{color};"></div></div>'
+                    for value, height, color in zip(values, heights, colors)
+                )
+                labels = "".join(f'<div>{category}</div>' for category in categories)
+                st.markdown(f"""
+<div class="material-card">
+    <h4 style="text-align: center;">Stress Distribution</h4>
+    <div class="bar-chart">{bars}</div>
+    <div class="bar-labels">{labels}</div>
 </div>
 """, unsafe_allow_html=True)
             
-            fatigue_cols = st.columns(5)
-            fatigue_data = [
-                ("Goodman", fatigue['Goodman'], "σa/Se + σm/UTS = 1", COLORS['Goodman']),
-                ("Soderberg", fatigue['Soderberg'], "σa/Se + σm/Sy = 1", COLORS['Soderberg']),
-                ("Gerber", fatigue['Gerber'], "σa/Se + (σm/UTS)² = 1", COLORS['Gerber']),
-                ("Morrow", fatigue['Morrow'], "σa/Se + σm/(UTS+345) = 1", COLORS['Morrow']),
-                ("ASME-Elliptic", fatigue['ASME-Elliptic'], "(σa/Se)² + (σm/Sy)² = 1", COLORS['ASME-Elliptic'])
-            ]
-            
-            for i, (name, value, equation, color) in enumerate(fatigue_data):
-                with fatigue_cols[i]:
-                    safe = value <= 1
-                    status = "✅ Safe" if safe else "❌ Unsafe"
-                    status_class = "safe" if safe else "unsafe"
-                    
-                    st.markdown(f"""
-                    <div class="card" style="border-left: 4px solid {color};">
-                        <h4 style="margin-top: 0;">{name}</h4>
-                        <div style="font-size: 0.85em; margin-bottom: 10px; color:{BLACK};">{equation}</div>
-                        <div class="value-display">{value:.3f}</div>
-                        <div class="{status_class}" style="margin-top: 10px;">{status}</div>
-                        <div style="height: 4px; background: {LIGHT_GRAY}; margin: 10px 0;">
-                            <div style="height: 4px; background: {color}; width: {min(100, value*100)}%;"></div>
-                        </div>
-                    </div>
-                    """, unsafe_allow_html=True)
-            
-            # Enhanced Plotting with Matplotlib with high contrast
-            st.markdown(f"""
-            <div class="section-header">
-                <h3 style="margin:0;">📉 Fatigue Analysis Diagram (All Datasets)</h3>
-            </div>
-            """, unsafe_allow_html=True)
-            
-            fig, ax = plt.subplots(figsize=(10, 6))
-            fig.patch.set_facecolor(WHITE)
-            
-            # Generate x-axis values
-            x = np.linspace(0, inputs['uts']*1.1, 100)
-            
-            # Plot all criteria with distinct grayscale and line styles
-            ax.plot(x, stresses['Se']*(1 - x/inputs['uts']), 
-                    color=COLORS['Goodman'], linewidth=2.5, linestyle='-', label='Goodman')
-            ax.plot(x, stresses['Se']*(1 - x/inputs['yield_stress']), 
-                    color=COLORS['Soderberg'], linewidth=2.5, linestyle='--', label='Soderberg')
-            ax.plot(x, stresses['Se']*(1 - (x/inputs['uts'])**2), 
-                    color=COLORS['Gerber'], linestyle=':', linewidth=2.5, label='Gerber')
-            ax.plot(x, stresses['Se']*(1 - x/stresses['sigma_f']), 
-                    color=COLORS['Morrow'], linestyle='-.', linewidth=2.5, label='Morrow')
-            ax.plot(x, stresses['Se']*np.sqrt(1 - (x/inputs['yield_stress'])**2), 
-                    color=COLORS['ASME-Elliptic'], linestyle=(0, (5, 1)), linewidth=2.5, label='ASME-Elliptic')
-            
-            # Plot operating points for all datasets
-            markers = ['o', 's', 'D']  # Circle, Square, Diamond
-            for i, (dataset_name, dataset) in enumerate(st.session_state.datasets.items()):
-                if dataset['results']:
-                    ds = dataset['results']['stresses']
-                    ax.scatter(ds['sigma_m'], ds['sigma_a'], 
-                              color=DATASET_COLORS[i], s=150, edgecolor='black', zorder=10,
-                              marker=markers[i], label=f'{dataset_name} (σm={ds["sigma_m"]:.1f}, σa={ds["sigma_a"]:.1f})')
-            
-            # Mark key points with consistent style
-            ax.scatter(0, stresses['Se'], color=COLORS['KeyPoints'], s=100, marker='o', 
-                      label=f'Se = {stresses["Se"]:.1f} MPa')
-            ax.scatter(inputs['uts'], 0, color=COLORS['KeyPoints'], s=100, marker='s', 
-                      label=f'UTS = {inputs["uts"]:.1f} MPa')
-            ax.scatter(inputs['yield_stress'], 0, color=COLORS['KeyPoints'], s=100, marker='^', 
-                      label=f'Sy = {inputs["yield_stress"]:.1f} MPa')
-            
-            # Formatting with high contrast - handle incomplete datasets
-            max_x = inputs['uts'] * 1.1
-            max_y = stresses['Se'] * 1.5
-            
-            # Collect all operating points to determine axis limits
-            all_points = []
-            for dataset in st.session_state.datasets.values():
-                if dataset['results']:
-                    ds = dataset['results']['stresses']
-                    all_points.append(ds['sigma_m'])
-                    all_points.append(ds['sigma_a'])
+            # Fatigue Assessment with Safety Status
+            st.markdown(SECTION_HEADER_TEMPLATE.substitute(
+                title=f"🛡️ Fatigue Assessment ({st.session_state.current_dataset})"
+            ), unsafe_allow_html=True)
             
-            if all_points:
-                max_x = max(max_x, max(all_points) * 1.2)
-                max_y = max(max_y, max(all_points) * 1.5)
+            # Safety flags and progress-bar widths for all cards in one vectorized pass
+            fatigue_safe = fatigue <= 1
+            fatigue_widths = np.clip(fatigue * 100, 0, 100)
             
-            ax.set_xlim(0, max_x)
-            ax.set_ylim(0, max_y)
-            ax.set_xlabel('Mean Stress (σm) [MPa]', fontsize=10, color=BLACK)
-            ax.set_ylabel('Alternating Stress (σa) [MPa]', fontsize=10, color=BLACK)
-            ax.set_title('Fatigue Analysis Diagram', fontsize=12, fontweight='bold', color=BLACK)
-            ax.grid(True, linestyle='--', alpha=0.7, color=MEDIUM_GRAY)
-            ax.set_facecolor(WHITE)
+            fatigue_cards = "".join(
+                FATIGUE_CARD_TEMPLATE.substitute(
+                    name=name, equation=equation, value=f"{value:.3f}", color=color, width=width,
+                    status_class="safe" if safe else "unsafe",
+                    status="✅ Safe" if safe else "❌ Unsafe"
+                )
+                for name, color, value, equation, safe, width in zip(
+                    FATIGUE_CRITERIA, FATIGUE_COLORS, fatigue, FATIGUE_EQUATIONS, fatigue_safe, fatigue_widths
+                )
+            )
+            st.markdown(f'<div class="card-grid">{fatigue_cards}</div>', unsafe_allow_html=True)
             
-            # Set axis and tick colors to black
-            ax.spines['bottom'].set_color(BLACK)
-            ax.spines['top'].set_color(BLACK) 
-            ax.spines['right'].set_color(BLACK)
-            ax.spines['left'].set_color(BLACK)
-            ax.tick_params(axis='x', colors=BLACK)
-            ax.tick_params(axis='y', colors=BLACK)
+            # Enhanced Plotting with Matplotlib with high contrast
+            st.markdown(SECTION_HEADER_TEMPLATE.substitute(
+                title="📉 Fatigue Analysis Diagram (All Datasets)"
+            ), unsafe_allow_html=True)
             
-            # Create custom legend
-            ax.legend(loc='upper right', bbox_to_anchor=(1.35, 1), fontsize=9, facecolor=WHITE, edgecolor=BLACK)
-            plt.tight_layout()
+            # Gather every dataset's stored results once for the diagram and comparison table
+            all_results = collect_dataset_results(st.session_state.datasets)
+            operating_points = tuple(
+                (i, all_results['names'][i], float(all_results['sigma_m'][i]), float(all_results['sigma_a'][i]))
+                for i in np.flatnonzero(all_results['analysed'])
+            )
             
-            st.pyplot(fig)
+            diagram_svg = render_fatigue_diagram(
+                (stresses['Se'], inputs['uts'], inputs['yield_stress'], stresses['sigma_f']),
+                operating_points
+            )
+            st.image(diagram_svg)
             
             # Dataset comparison table
-            st.markdown(f"""
-            <div class="section-header">
-                <h3 style="margin:0;">📋 Dataset Comparison</h3>
-            </div>
-            """, unsafe_allow_html=True)
-            
-            # Create comparison table
-            comparison_data = []
-            headers = ["Parameter", "Dataset 1", "Dataset 2", "Dataset 3"]
+            st.markdown(SECTION_HEADER_TEMPLATE.substitute(
+                title="📋 Dataset Comparison"
+            ), unsafe_allow_html=True)
             
-            # Add mean stress and alternating stress
-            comparison_data.append(["Mean Stress (σm)", "", "", ""])
-            comparison_data.append(["Alternating Stress (σa)", "", "", ""])
+            # Create comparison table - format the (parameter x dataset) value grid in
+            # one pass and mask datasets without results
+            comparison_values = np.vstack([
+                np.char.mod("%.2f MPa", np.vstack([all_results['sigma_m'], all_results['sigma_a']])),
+                np.char.mod("%.3f", all_results['fatigue'].T)
+            ])
+            comparison_values = np.where(all_results['analysed'], comparison_values, "N/A")
             
-            # Add fatigue criteria
-            for criterion in fatigue_data:
-                comparison_data.append([criterion[0], "", "", ""])
-            
-            # Fill in values
-            for i, dataset_name in enumerate(st.session_state.datasets.keys()):
-                dataset = st.session_state.datasets[dataset_name]
-                if dataset['results']:
-                    stresses = dataset['results']['stresses']
-                    fatigue = dataset['results']['fatigue']
-                    
-                    # Update values
-                    comparison_data[0][i+1] = f"{stresses['sigma_m']:.2f} MPa"
-                    comparison_data[1][i+1] = f"{stresses['sigma_a']:.2f} MPa"
-                    
-                    # Fatigue criteria
-                    for j, criterion in enumerate(fatigue_data):
-                        comparison_data[2+j][i+1] = f"{fatigue[criterion[0]]:.3f}"
-                else:
-                    # Show placeholder for incomplete datasets
-                    comparison_data[0][i+1] = "N/A"
-                    comparison_data[1][i+1] = "N/A"
-                    for j in range(len(fatigue_data)):
-                        comparison_data[2+j][i+1] = "N/A"
+            headers = ["Parameter"] + all_results['names']
+            comparison_data = [[parameter] + row for parameter, row in zip(COMPARISON_PARAMETERS, comparison_values.tolist())]
             
             # Display table
             html_table = "<table style='width:100%; border-collapse: collapse; border: 1px solid black;'>"
@@ -1002,11 +1175,8 @@ else:
     """, unsafe_allow_html=True)
 
 # References and links in expanders
-st.markdown(f"""
-<div class="section-header">
-    <h3 style="margin:0;">📚 References & Resources</h3>
-</div>
-""", unsafe_allow_html=True)
+st.markdown(SECTION_HEADER_TEMPLATE.substitute(title="📚 References & Resources"),
+            unsafe_allow_html=True)
 
 ref_col1, ref_col2 = st.columns([1, 1])
 with ref_col1:
@@ -1040,9 +1210,10 @@ with ref_col2:
         </div>
         """, unsafe_allow_html=True)
 
-# Footer
-st.markdown("---")
-st.markdown(f"""
+# Footer - built once per server process like the page head
+@st.cache_resource(show_spinner=False)
+def build_footer():
+    return f"""
 <div style="background-color:{LIGHT_GRAY}; padding:20px; border-radius:5px; margin-top:20px; border-top: 2px solid {BLACK}">
     <div style="display: flex; justify-content: space-between; align-items: center; color:{BLACK};">
         <div>
@@ -1055,4 +1226,7 @@ st.markdown(f"""
         </div>
     </div>
 </div>
-""", unsafe_allow_html=True)
+"""
+
+st.markdown("---")
+st.markdown(build_footer(), unsafe_allow_html=True)